@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from setuptools import setup, find_packages
+from setuptools import setup
 
 setup(
     name='nros-core',
@@ -9,14 +9,15 @@ setup(
     description='Core part of nROS framework',
     install_requires=['dbus-python'],
     extras_require={
-        'systemd': ['pybot-systemd']
+        'systemd': ['pybot-systemd'],
+        'fastjson': ['ujson']
     },
     license='LGPL',
     author='Eric Pascual',
     author_email='eric@pobot.org',
     url='http://www.pobot.org',
     download_url='https://github.com/Pobot/PyBot',
-    packages=find_packages("src"),
+    packages=['nros', 'nros.core', 'nros.core.setup'],
     package_dir={'': 'src'},
     entry_points={
         'console_scripts': [
@@ -32,5 +33,6 @@ setup(
     },
     package_data={
         'nros.core.setup': ['pkg_data/*']
-    }
+    },
+    zip_safe=False
 )
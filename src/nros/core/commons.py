@@ -7,17 +7,15 @@
 """
 
 import os
+import re
 import signal
 import subprocess
 
-from dbus.bus import BusConnection
-from dbus import Interface
-
 __author__ = 'Eric Pascual'
 
 __all__ = [
     'dbus_init',
-    'start_session_bus', 'stop_session_bus', 'session_bus_is_running', 'get_bus_config',
+    'start_session_bus', 'stop_session_bus', 'session_bus_is_running', 'get_bus_config', 'get_bus_state',
     'bus_monitor',
     'get_bus', 'get_remote_bus',
     'get_node_proxy', 'get_node_interface',
@@ -26,48 +24,89 @@ __all__ = [
 
 DBUS_ENV_FILE = '/tmp/nros-session-bus'
 
+# when set to a non empty value, nodes use the session bus advertised by DBUS_SESSION_BUS_ADDRESS
+# instead of launching the nROS one (see start_session_bus)
+ADOPT_SESSION_BUS_VAR = 'NROS_ADOPT_SESSION_BUS'
+
+# matches the variable settings lines of the ``dbus-launch --sh-syntax`` output
+# (values may contain '=' and ';', as in multi-transports bus addresses)
+_KV_RE = re.compile(r"^([A-Z_][A-Z0-9_]*)='?(.*?)'?;?$", re.MULTILINE)
+
+# parsed content of the bus environment file, keyed by its modification time
+_bus_config_cache = {'mtime': None, 'data': None}
+
+# the main loop shared by all dbus_init() callers
+_main_loop = None
+
 
 def dbus_init():
     """ D-Bus environment initialization.
 
-    Must be called before doing anything related to D-Bus.
+    Must be called before doing anything related to D-Bus. The initialization is done only once,
+    subsequent calls returning the same main loop.
 
     :return: the D-Bus mainloop, to be started by its :py:meth:`run` method when ready
     :rtype: glib.MainLoop
     """
-    import dbus.mainloop.glib
-    import gobject
+    global _main_loop
+    if _main_loop is None:
+        import dbus.mainloop.glib
+        import gobject
+
+        dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+        # still required with the static gobject bindings for other Python threads to run
+        # while the main loop is blocked in C code
+        gobject.threads_init()
+        dbus.mainloop.glib.threads_init()
+
+        _main_loop = gobject.MainLoop()
 
-    dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
-    gobject.threads_init()
-    dbus.mainloop.glib.threads_init()
+    return _main_loop
 
-    return gobject.MainLoop()
 
+def start_session_bus(logger=None, adopt=False):
+    """ Starts the nROS bus if not already running.
 
-def start_session_bus(logger=None):
+    :param logger: optional logger for tracing the process
+    :param bool adopt: if True, the session bus advertised by the environment is used instead of
+        launching the nROS one, provided the ``NROS_ADOPT_SESSION_BUS`` variable is set. This
+        bus is not recorded, and is thus seen only by the calling process.
+    :return: the bus configuration, and whether it was already running
+    :rtype: tuple
+    """
     is_running = session_bus_is_running()
     if not is_running:
+        address = os.environ.get('DBUS_SESSION_BUS_ADDRESS')
+        if adopt and address and os.environ.get(ADOPT_SESSION_BUS_VAR):
+            # the adopted bus belongs to the user session, so it is not recorded in the shared
+            # environment file where other users' nodes would pick it up
+            if logger:
+                logger.info('using existing session bus (%s)', address)
+            return {'DBUS_SESSION_BUS_ADDRESS': address}, True
+
         if logger:
             logger.info('starting nROS bus...')
-        error = subprocess.call("dbus-launch --sh-syntax > " + DBUS_ENV_FILE, shell=True)
-        if error:
-            # ensure no env file is left around
-            try:
-                os.remove(DBUS_ENV_FILE)
-            except OSError:
-                pass
-            raise Exception("dbus-launch failed with rc=%d" % error)
+        p = subprocess.Popen(['dbus-launch', '--sh-syntax'], stdout=subprocess.PIPE, universal_newlines=True)
+        out, _ = p.communicate()
+        if p.returncode:
+            raise Exception("dbus-launch failed with rc=%d" % p.returncode)
+        return _store_bus_config(out), False
 
     return get_bus_config(), is_running
 
 
 def stop_session_bus():
-    if session_bus_is_running():
-        d = get_bus_config()
-        pid = d['DBUS_SESSION_BUS_PID']
-        os.kill(int(pid), signal.SIGTERM)
+    d = get_bus_state()
+    if d is None:
+        return
+
+    os.kill(int(d['DBUS_SESSION_BUS_PID']), signal.SIGTERM)
+    try:
         os.remove(DBUS_ENV_FILE)
+    except OSError:
+        # dbus-launch cleanup went first
+        pass
+    _bus_config_cache['mtime'] = _bus_config_cache['data'] = None
 
 
 def session_bus_is_running():
@@ -75,32 +114,72 @@ def session_bus_is_running():
 
 
 def get_bus_config():
-    d = {}
-    for line in [line for line in file(DBUS_ENV_FILE) if '=' in line]:
-        var, value = line.split('=', 1)
-        d[var] = value.strip().strip(';').strip("'")
+    st = os.stat(DBUS_ENV_FILE)
+    if st.st_mtime == _bus_config_cache['mtime']:
+        return _bus_config_cache['data']
+
+    with open(DBUS_ENV_FILE) as f:
+        d = dict(_KV_RE.findall(f.read()))
+
+    _bus_config_cache['mtime'] = st.st_mtime
+    _bus_config_cache['data'] = d
     return d
 
 
-def bus_monitor():
-    if session_bus_is_running():
-        d = get_bus_config()
-        error = subprocess.call("dbus-monitor --address %s" % d['DBUS_SESSION_BUS_ADDRESS'], shell=True)
-        if error:
-            raise Exception("dbus-monitor failed with rc=%d" % error)
+def _store_bus_config(text):
+    """ Writes the bus environment file and returns its parsed content, which is cached
+    so that the file does not need to be read back.
+    """
+    d = dict(_KV_RE.findall(text))
+    with open(DBUS_ENV_FILE, 'w') as f:
+        f.write(text)
 
+    _bus_config_cache['mtime'] = os.stat(DBUS_ENV_FILE).st_mtime
+    _bus_config_cache['data'] = d
+    return d
 
-def get_bus(address_or_type=BusConnection.TYPE_SESSION):
+
+def get_bus_state():
+    """ Returns the bus configuration, or None if the bus is not running.
+
+    Costs a single ``stat`` when the configuration is already cached.
+    """
+    try:
+        return get_bus_config()
+    except (OSError, IOError):
+        return None
+
+
+def bus_monitor(config=None):
+    """ Replaces the current process by a ``dbus-monitor`` attached to the nROS bus.
+
+    Does not return if the bus is running.
+
+    :param dict config: the bus configuration, if already known (see :py:func:`get_bus_state`)
+    """
+    if config is None:
+        config = get_bus_state()
+    if config is not None:
+        os.execvp('dbus-monitor', ['dbus-monitor', '--address', config['DBUS_SESSION_BUS_ADDRESS']])
+
+
+def get_bus(address_or_type=None):
     """ Returns a given bus, either from the local system or from a remote one, thanks to D-Bus TCP support.
 
     The parameter is used the same way as in D-Bus class :py:class:`BusConnection`. Refer to original
     documentation for details.
 
-    :param address_or_type: request bus identification
+    :param address_or_type: request bus identification (default: the session bus)
     :return: the requested bus
     :rtype: BusConnection
     """
-    os.environ.update(get_bus_config())
+    from dbus.bus import BusConnection
+
+    if address_or_type is None:
+        address_or_type = BusConnection.TYPE_SESSION
+    cfg = get_bus_config()
+    if os.environ.get('DBUS_SESSION_BUS_ADDRESS') != cfg.get('DBUS_SESSION_BUS_ADDRESS'):
+        os.environ.update(cfg)
     return BusConnection(address_or_type)
 
 
@@ -115,6 +194,8 @@ def get_remote_bus(host, port):
     :return: the requested bus
     :rtype: BusConnection
     """
+    from dbus.bus import BusConnection
+
     return BusConnection("tcp:host=%s,port=%d" % (host, port))
 
 
@@ -140,6 +221,8 @@ def get_node_interface(proxy, interface_name):
     :return: the requested interface
     :rtype: :py:class:`dbus.proxies.Interface`
     """
+    from dbus import Interface
+
     return Interface(proxy, dbus_interface=interface_name)
 
 
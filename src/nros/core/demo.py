@@ -9,7 +9,7 @@ It uses the :py:mod:`curses` package.
 import curses
 import argparse
 import textwrap
-from multiprocessing.pool import ThreadPool
+import threading
 import logging
 import os
 import tempfile
@@ -59,6 +59,8 @@ class Demo(object):
     COLOR_SUCCESS_MESSAGE = curses.COLOR_GREEN
     COLOR_DEFAULT_MESSAGE = curses.COLOR_BLUE
 
+    _exit_keys = frozenset(('q', 'Q'))
+
     @classmethod
     def add_demo_arguments(cls, parser):
         """ Application specific CLI options.
@@ -188,7 +190,9 @@ class Demo(object):
             try:
                 curses.start_color()
                 curses.use_default_colors()
-                for i in range(0, curses.COLORS):
+                # each color uses the pair of the same number, so that sub-classes can use any of them
+                # (pair 0 being the terminal default one which cannot be changed)
+                for i in range(1, curses.COLORS):
                     curses.init_pair(i, i, -1)
             except:
                 pass
@@ -219,7 +223,6 @@ class Demo(object):
             app_logger.info(' Terminated '.center(60, '-'))
 
             if run_error:
-                import textwrap
                 print(textwrap.dedent("""
                 Abnormal termination due to error:
                 ---------------------------------
@@ -243,6 +246,19 @@ class Demo(object):
         self.COLOR_DEFAULT_MESSAGE = curses.color_pair(self.COLOR_DEFAULT_MESSAGE)
         self.COLOR_ERROR_MESSAGE = curses.color_pair(self.COLOR_ERROR_MESSAGE)
         self.COLOR_SUCCESS_MESSAGE = curses.color_pair(self.COLOR_SUCCESS_MESSAGE)
+        self._attr_exit = curses.color_pair(curses.COLOR_GREEN)
+        self._attr_desc = curses.color_pair(curses.COLOR_BLUE)
+
+    @classmethod
+    def _prepared_text(cls):
+        """ Returns the lines of the description and usage texts, which are dedented and split
+        only once per concrete class.
+        """
+        if '_text_lines' not in cls.__dict__:
+            cls._text_lines = tuple(
+                textwrap.dedent(s).strip().split('\n') for s in (cls.DESCRIPTION, cls.USAGE)
+            )
+        return cls._text_lines
 
     def run(self):
         h, w = self.MAIN_WINDOW_SIZE
@@ -252,21 +268,22 @@ class Demo(object):
         wnd_main.addstr(0, 2, " " + self.TITLE + " ")
 
         s = " 'q': Exit "
-        wnd_main.addstr(h - 1, w - len(s) - 2, s, curses.color_pair(curses.COLOR_GREEN))
+        wnd_main.addstr(h - 1, w - len(s) - 2, s, self._attr_exit)
 
-        def display_text(y, x, s, attr=0):
-            lines = textwrap.dedent(s).strip().split('\n')
+        def display_text(y, x, lines, attr=0):
             for line in lines:
                 wnd_main.addstr(y, x, line, attr)
                 y += 1
             return y
 
+        desc_lines, usage_lines = self._prepared_text()
+
         if self.DESCRIPTION:
-            y = display_text(2, 3, self.DESCRIPTION, curses.color_pair(curses.COLOR_BLUE)) + 1
+            y = display_text(2, 3, desc_lines, self._attr_desc) + 1
 
         if self.USAGE:
             wnd_main.addstr(y, 3, "Usage:", curses.A_BOLD)
-            y = display_text(y + 1, 7, self.USAGE) + 1
+            y = display_text(y + 1, 7, usage_lines) + 1
 
         wnd_main.refresh()
 
@@ -286,8 +303,9 @@ class Demo(object):
         self.setup(bus, wnd_client)
         self.logger.info('<<< normal return from setup()')
 
-        pool = ThreadPool(processes=1)
-        pool.apply_async(self.ui_loop, args=(dbus_loop,))
+        ui_thread = threading.Thread(target=self.ui_loop, args=(dbus_loop,), name='ui_loop')
+        ui_thread.daemon = True
+        ui_thread.start()
 
         self.logger.info('starting D-Bus main loop')
         dbus_loop.run()
@@ -299,18 +317,16 @@ class Demo(object):
         Called internally and not to be used by applications or sub-classes
         """
         logger = self.logger.getChild('ui_loop')
+        log_event = logger.info
+        log_events = logger.isEnabledFor(logging.INFO)
         try:
             logger.info(' started '.center(40, '-'))
             while True:
                 event = self._stdscr.getch()
-                try:
-                    key = chr(event)
-                except ValueError:
-                    key = None
-                    logger.info("event=0x%x", event)
-                else:
-                    logger.info("event=0x%x key='%s'", event, key)
-                if key in ('q', 'Q'):
+                key = chr(event) if 0 <= event < 256 else None
+                if log_events:
+                    log_event("event=0x%x key=%r", event, key)
+                if key in self._exit_keys:
                     break
 
                 if not self.loop(event, key, logger):
@@ -329,7 +345,10 @@ class Demo(object):
             dbus_loop.quit()
 
     def _display_message(self, msg, attr):
-        self._stdscr.addstr(1, 1, msg[:self.inner_width].ljust(self.inner_width), attr)
+        n = min(len(msg), self.inner_width)
+        self._stdscr.addnstr(1, 1, msg, n, attr)
+        # blank the rest of the status line up to the window border (clrtoeol would erase it too)
+        self._stdscr.hline(1, 1 + n, ' ', self.inner_width - n)
 
     def display_error_message(self, error):
         """ Displays an error message in the status line of the window.
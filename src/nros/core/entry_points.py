@@ -1,60 +1,71 @@
 # -*- coding: utf-8 -*-
 
-import os
+import sys
 
-from nros.core.commons import start_session_bus, session_bus_is_running, stop_session_bus, get_bus_config, bus_monitor
+from nros.core.commons import start_session_bus, stop_session_bus, bus_monitor, get_bus_state
 
 __author__ = 'Eric Pascual'
 
 PKG_NAME = 'nros.dynamixel'
 
-_CONFIG_DIR = os.path.join('/etc', PKG_NAME.replace('.', '/'))
+# generated: os.path.join('/etc', PKG_NAME.replace('.', '/'))
+_CONFIG_DIR = '/etc/nros/dynamixel'
 
 
-def nros_bus_start():
-    if session_bus_is_running():
-        print('nROS bus already started.')
+def _status_lines(state):
+    return ['nROS bus is %s.' % ('stopped' if state is None else 'started')]
+
+
+def _config_lines(state):
+    if state is None:
+        return ['nROS bus not started.']
     else:
+        return ["- %-25s : %s" % kv for kv in sorted(state.items())]
+
+
+def _output(lines):
+    # one single write instead of a print per line
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+
+def nros_bus_start():
+    state = get_bus_state()
+    if state is None:
         print('Starting nROS bus...')
-        config, _ = start_session_bus()
-        nros_bus_status()
+        state, _ = start_session_bus()
+        lines = _status_lines(state)
+    else:
+        lines = ['nROS bus already started.']
 
-    print("Configuration :")
-    nros_bus_config()
+    lines.append("Configuration :")
+    _output(lines + _config_lines(state))
 
 
 def nros_bus_stop():
-    if session_bus_is_running():
+    if get_bus_state() is None:
+        print('nROS bus not started.')
+    else:
         print('Stopping nROS bus...')
         stop_session_bus()
-        nros_bus_status()
-    else:
-        print('nROS bus not started.')
+        _output(_status_lines(get_bus_state()))
 
 
 def nros_bus_status():
-    print('nROS bus is %s.' % ('started' if session_bus_is_running() else 'stopped'))
+    _output(_status_lines(get_bus_state()))
 
 
 def nros_bus_config():
-    if session_bus_is_running():
-        config = get_bus_config()
-        for k, v in config.iteritems():
-            print("- %-25s : %s" % (k, v))
-
-    else:
-        print('nROS bus not started.')
+    _output(_config_lines(get_bus_state()))
 
 
 def nros_bus_monitor():
-    if session_bus_is_running():
-        try:
-            print('-- Starting bus monitor (Ctrl-C to end)\n')
-            bus_monitor()
-        except KeyboardInterrupt:
-            print('\r  \n-- Monitoring ended.')
-        except Exception as e:
-            print(e.message)
-
-    else:
+    state = get_bus_state()
+    if state is None:
         print('nROS bus not started.')
+    else:
+        print('-- Starting bus monitor (Ctrl-C to end)\n')
+        sys.stdout.flush()
+        try:
+            bus_monitor(state)
+        except OSError as e:
+            print(e)
@@ -17,22 +17,98 @@ import signal
 import logging.config
 import sys
 import os
-import json
+import re
+import errno
+import fcntl
+import io
+import argparse
+import threading
+import functools
 from datetime import datetime
 
-import dbus.mainloop.glib
-import dbus.service
-import gobject
+try:
+    # faster C decoder, if available (optional dependency)
+    from ujson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 from nros.core import cli
 from nros.core import log
 from nros.core.commons import start_session_bus
+from nros.core.properties import PropertiesChangedBatch
 
 __author__ = 'Eric Pascual'
 
 
 DEFAULT_SERVICE_OBJECT_PATH = '/'
 
+# process identity, which does not change during its lifetime (see NROSNode._refresh_ids after a fork)
+_PID = os.getpid()
+_UID = os.getuid()
+_IS_ROOT = os.geteuid() == 0
+
+# default log file location : named after the main script, in a directory depending on the current user
+_LOG_NAME = os.path.splitext(os.path.basename(sys.argv[0]))[0] + '.log'
+_LOG_DIR = '/var/log/nros' if _IS_ROOT else os.path.expanduser('~/.nros/log')
+
+# tokens written to the signal pipe by the termination signals handler
+_SIGNAL_TOKENS = {signal.SIGTERM: b'T', signal.SIGINT: b'I'}
+_TOKEN_SIGNALS = dict((token, signum) for signum, token in _SIGNAL_TOKENS.iteritems())
+
+# D-Bus well-known names : at least 2 dot separated elements, not starting with a digit, 255 chars max
+_BUS_NAME_RE = re.compile(r'(?=.{1,255}\Z)[A-Za-z_-][A-Za-z0-9_-]*(\.[A-Za-z_-][A-Za-z0-9_-]*)+\Z')
+
+
+def _readable_file(path):
+    """ ``argparse`` type checking that a path can be opened for reading, without keeping
+    the file open.
+    """
+    try:
+        io.open(path, 'rb').close()
+    except IOError as e:
+        raise argparse.ArgumentTypeError("can't open '%s': %s" % (path, e))
+    return path
+
+
+# command line arguments common to all nodes, as (flags, add_argument keyword arguments) pairs
+# ("{node_class}" being replaced in help texts by the name of the node class)
+_COMMON_ARGS = (
+    (('-n', '--name'), dict(
+        dest='name',
+        help='node name (default: nros.{node_class}-<pid>)'
+    )),
+    (('-C', '--config'), dict(
+        dest='config',
+        type=_readable_file,
+        help='configuration file path (default: %(default)s)'
+    )),
+    (('--logger-config',), dict(
+        dest='log_cfg',
+        type=_readable_file,
+        help='logging customisation (default: %(default)s)'
+    )),
+)
+
+
+def _read_json(path):
+    """ Returns the JSON data contained in a file.
+
+    :param str path: the path of the file
+    :return: the decoded data
+    """
+    with io.open(path, 'rb') as f:
+        return json_loads(f.read())
+
+
+class _ClassLogger(object):
+    """ Descriptor returning the logger named after the class it is accessed from, either
+    directly or through one of its instances.
+
+    Being a non-data descriptor, it can be overridden by a plain assignment.
+    """
+    def __get__(self, obj, owner):
+        return logging.getLogger(owner.__name__)
+
 
 class NROSNode(object):
     """ Base class for implementing a nROS node.
@@ -70,7 +146,9 @@ class NROSNode(object):
     ``setup_dbus_environment``
 
         Everybody is now up and running, and it is time to bind them to D-Bus by creating and
-        preparing the required service objects.
+        preparing the required service objects. The connection to use for this is returned by
+        :py:meth:`get_session_bus`. Do not create new ones with ``dbus.SessionBus()``, since
+        each one involves a costly negotiation with the bus daemon.
 
     ``shutdown``
 
@@ -82,12 +160,31 @@ class NROSNode(object):
     as root user, or in `~/.nros/log/` if standard user. The name of the log file is the same as the
     start script one. A customized configuration of logging can be provided using the ` --logger-config`
     CLI option. See details in :py:meth:`_setup_logging` method.
+
+    Nodes which do not use threads besides the main one can set the :py:attr:`multithreaded`
+    class attribute to False, sparing the GLib and D-Bus thread support overhead on each
+    dispatched event.
     """
-    _logger = None
-    _node = None
-    _loop = None
+    #: set to False in sub-classes which do not use other threads than the main one. Beware that
+    #: threads would otherwise be blocked while the main loop waits for events.
+    multithreaded = True
+
+    #: set to True in sub-classes which do not use the nROS bus before :py:meth:`setup_dbus_environment`,
+    #: so that the bus startup runs in parallel with the node initialization and configuration
+    deferred_bus_connection = False
+
+    # for sub-classes written when the logger was stored as a class attribute
+    _logger = _ClassLogger()
+
     _verbose = False
     _debug = False
+    _bus_cfg = None
+    _bus_error = None
+    _session_bus = None
+    _running = False
+    _dbus_inited = False
+    _signal_pipe = None
+    _logging_configured = False
 
     @classmethod
     def add_arguments_to_parser(cls, parser):
@@ -96,18 +193,26 @@ class NROSNode(object):
         Override this method to add arguments to the parser already initialized with common
         ones, using :meth:`ArgumentParser.add_argument` standard method.
 
+        The arguments can also be returned as a sequence of ``(flags, kwargs)`` pairs, which
+        are passed to ``add_argument`` as ``add_argument(*flags, **kwargs)``:
+
+        >>> return [
+        >>>     (('-p', '--port'), dict(dest='port', type=int, default=8080)),
+        >>> ]
+
         The default method is empty, so that you don't need to call `super` in your version.
         But it is wiser to do it anyway, in case some process would be added here in the future.
 
         Arguments included by default to the parser are:
 
-        - ``-n``, ``--name`` : the name of the node **(required)**
-        - ``-C``, ``--config`` : the node configuration file path **(required)**
+        - ``-n``, ``--name`` : the name of the node
+        - ``-C``, ``--config`` : the node configuration file path
         - ``--logger-config`` : the logging configuration file path
         - ``--verbose`` : verbose logs
         - ``--debug`` : debug mode activation
 
         :param ArgumentParser parser: the argument parser
+        :return: the additional arguments specifications, if any
         """
 
     @classmethod
@@ -115,7 +220,13 @@ class NROSNode(object):
         """ Override this method to use another event loop than the default one.
 
         Should not be needed most of the time, apart if the node is part of a GUI application.
+
+        The returned object only needs to provide ``run()`` (blocking until the node terminates)
+        and ``quit()`` methods. Note however that the D-Bus connection relies on the GLib
+        integration, so the loop must dispatch the default GLib context.
         """
+        import gobject
+
         return gobject.MainLoop()
 
     def init_node(self):
@@ -131,8 +242,12 @@ class NROSNode(object):
 
         Since the base method is empty, there is no need to invoke ``super``.
 
+        The nROS bus is already available at this stage, unless :py:attr:`deferred_bus_connection`
+        is set.
+
         :param file cfg_file: a read-only opened file located at the path specified by
             then command line `-C/--config` argument if any. It will be None if the option is not used.
+            The file is closed when the method returns.
         """
 
     def _get_cfg_dict(self, cfg):
@@ -154,11 +269,11 @@ class NROSNode(object):
         if isinstance(cfg, dict):
             return cfg
 
-        elif isinstance(cfg, file):
-            return json.load(cfg)
+        elif hasattr(cfg, 'read'):
+            return json_loads(cfg.read())
 
         elif isinstance(cfg, basestring):
-            return json.load(file(cfg, 'rt'))
+            return _read_json(cfg)
 
         else:
             raise TypeError(self.logged_message('unsupported configuration data type'))
@@ -174,7 +289,8 @@ class NROSNode(object):
     def prepare_node(self):
         """ Prepare the node to be run.
 
-        Last pre-flight checks should take place here.
+        Last pre-flight checks should take place here. As for :py:meth:`configure`, the nROS bus
+        is not available yet if :py:attr:`deferred_bus_connection` is set.
 
         Since the default implementation of ``prepare_node`` does nothing,
         you don't need to invoke ``super`` in the overridden version.
@@ -188,6 +304,9 @@ class NROSNode(object):
         Since the default implementation of ``setup_dbus_environment`` does nothing,
         you don't need to invoke ``super`` in the overridden version.
 
+        Bursts of properties changes should be published with :py:meth:`batched_updates`
+        rather than one signal per property.
+
         :param :py:class:`dbus.service.BusName` bus_name: the well known name used for this node
         """
 
@@ -209,12 +328,16 @@ class NROSNode(object):
         built with the concrete class name and the process id.
 
         :param str name: the name of the node. (optional)
+        :raises ValueError: if the name is not a valid D-Bus well-known name
         """
         if not name:
-            name = 'nros.%s-%d' % (self.__class__.__name__, os.getpid())
+            name = 'nros.%s-%d' % (self.__class__.__name__, _PID)
+        elif not _BUS_NAME_RE.match(name):
+            raise ValueError(self.logged_message("invalid node name '%s' (not a D-Bus well-known name)" % name))
 
-        self._logger.info("initializing node '%s'" % name)
+        self.log().info("initializing node '%s'", name)
         self.name = name
+        self._loop = self.get_mainloop()
         self.init_node()
 
     def terminate(self):
@@ -222,10 +345,18 @@ class NROSNode(object):
 
         Kill signals are automatically handled to trigger the node termination stage.
         """
-        self._logger.info('terminate called')
+        self.log().info('terminate called')
         self.shutdown()
         self._loop.quit()
 
+    @classmethod
+    def log(cls):
+        """ Returns the logger of the node, named after its class.
+
+        :rtype: logging.Logger
+        """
+        return logging.getLogger(cls.__name__)
+
     def logged_message(self, msg):
         """ An helper method which "tee" a message to the logger.
 
@@ -236,10 +367,11 @@ class NROSNode(object):
         :param str msg: the message to be logged
         :return: the message
         """
-        self._logger.error(msg)
+        self.log().error(msg)
         return msg
 
     BANNER_WIDTH = 60
+    _TERMINATION_BANNER = ' termination signal caught '.center(BANNER_WIDTH, '!')
 
     @classmethod
     def _make_banner(cls, msg):
@@ -256,71 +388,115 @@ class NROSNode(object):
         """
         args = cls._process_command_line(args)
 
-        cls._logger = cls._setup_logging(args.log_cfg)
-        cls._logger.info(cls._make_banner('NODE STARTED'))
-        cls._logger.info('Invocation arguments:')
+        cls._setup_logging(args.log_cfg)
+        logger = cls.log()
+
+        # handle termination requests as soon as possible, including during the configuration
+        cls._open_signal_pipe()
+        signal.signal(signal.SIGTERM, cls._sigterm_handler)
+        signal.signal(signal.SIGINT, cls._sigterm_handler)
+
+        logger.info(cls._make_banner('NODE STARTED'))
+        logger.info('Invocation arguments:')
         for k, v in vars(args).iteritems():
-            cls._logger.info('- %s : %s', k, v)
-        cls._logger.info('Execution context:')
-        cls._logger.info('- uid : %d', os.getuid())
-        cls._logger.info('- pid : %d', os.getpid())
+            logger.info('- %s : %s', k, v)
+        logger.info('Execution context:')
+        logger.info('- uid : %d', _UID)
+        logger.info('- pid : %d', _PID)
+
+        # starting the bus can take a while on small boards, so do it in parallel with the D-Bus init
+        # (and with the node configuration if the sub-class allows it)
+        bus_starter = threading.Thread(target=cls._bg_start_bus, name='bus_starter')
+        bus_starter.start()
 
         cls._init_dbus()
-        cls._logger.info('D-Bus init ok')
+        logger.info('D-Bus init ok')
 
-        cls._node = node = cls(name=getattr(args, 'name', None))
-        node._verbose = args.verbose
-        if args.verbose:
-            cls._logger.info('verbose mode activated')
-            cls._logger.setLevel(logging.DEBUG)
+        if not cls.deferred_bus_connection:
+            bus_starter.join()
+            cls._connect_bus()
 
-        node._debug = args.debug
-        if args.debug:
-            cls._logger.warn('debug mode activated')
+        verbose, debug = args.verbose, args.debug
+
+        try:
+            node = cls(name=args.name)
+        except Exception as e:
+            cls.die("node initialization failure", e)
+        node._verbose = verbose
+        if verbose:
+            logger.info('verbose mode activated')
+            logger.setLevel(logging.DEBUG)
+
+        node._debug = debug
+        if debug:
+            logger.warn('debug mode activated')
 
         if args.config:
             try:
-                cls._logger.info('processing configuration... (cfg=%s)', args.config.name)
-                node.configure(args.config)
+                logger.info('processing configuration... (cfg=%s)', args.config)
+                with open(args.config) as cfg_file:
+                    node.configure(cfg_file)
             except Exception as e:
                 cls.die("configuration failure", e)
 
         else:
-            cls._logger.warn('no configuration file specified')
+            logger.warn('no configuration file specified')
 
-        cls._logger.info('preparing node...')
+        logger.info('preparing node...')
         try:
             node.prepare_node()
         except Exception as e:
             cls.die("node preparation failure", e)
 
-        cls._logger.info('registering to nROS bus as %s', node.name)
-        bus_name = dbus.service.BusName(node.name, bus=dbus.SessionBus())
+        if cls.deferred_bus_connection:
+            bus_starter.join()
+            cls._connect_bus()
+
+        logger.info('registering to nROS bus as %s', node.name)
+        import dbus.service
+
+        bus_name = dbus.service.BusName(node.name, bus=cls._session_bus)
         try:
             node.setup_dbus_environment(bus_name)
         except Exception as e:
             cls.die("DBus environment setting failure", e)
 
-        signal.signal(signal.SIGTERM, cls._sigterm_handler)
-
-        try:
-            cls._logger.info('starting loop')
-            cls._loop.run()
-            cls._logger.info('loop exited')
+        import gobject
 
-        except KeyboardInterrupt:
-            cls._logger.info(" termination signal caught ".center(cls.BANNER_WIDTH, '!'))
-            node.terminate()
+        # termination signals caught from now on are processed by the loop on behalf of the node
+        signal_watch = gobject.io_add_watch(
+            NROSNode._signal_pipe[0], gobject.IO_IN, functools.partial(cls._process_signal_pipe, node)
+        )
 
-        cls._logger.info(cls._make_banner('NODE STOPPED'))
+        logger.info('starting loop')
+        cls._running = True
+        try:
+            while True:
+                try:
+                    node._loop.run()
+                    break
+                except EnvironmentError as e:
+                    # some GLib versions report interrupted polls instead of resuming them
+                    if e.errno not in (errno.EINTR, errno.EAGAIN):
+                        raise
+                    if not cls._running:
+                        break
+                    logger.warn('loop interrupted (%s), resuming it', errno.errorcode[e.errno])
+            logger.info('loop exited')
+        finally:
+            gobject.source_remove(signal_watch)
+            cls._close_signal_handling()
+
+        logger.info(cls._make_banner('NODE STOPPED'))
 
     @classmethod
     def die(cls, msg, exception=None):
-        if cls._logger:
-            cls._logger.fatal(msg)
+        if NROSNode._logging_configured:
+            logger = cls.log()
+            logger.fatal(msg)
             if exception:
-                cls._logger.exception(' : '.join([exception.__class__.__name__, exception.message]))
-            cls._logger.error(cls._make_banner('NODE ABORTED'))
+                logger.exception(' : '.join([exception.__class__.__name__, str(exception)]))
+            logger.error(cls._make_banner('NODE ABORTED'))
         else:
             sys.stderr.write("[FATAL ERROR] %s\n" % msg)
             if exception:
@@ -332,31 +508,88 @@ class NROSNode(object):
 
     @classmethod
     def _sigterm_handler(cls, signum, frame):
-        cls._logger.info('!!! SIGTERM caught !!!')
-        cls._node.terminate_ui_loop()
+        if cls._running:
+            # nothing else than async-signal-safe operations here : the termination is handled
+            # by the loop, in normal context (see _process_signal_pipe)
+            os.write(NROSNode._signal_pipe[1], _SIGNAL_TOKENS[signum])
+        else:
+            # the loop is not started yet, so there is nothing to wind down
+            cls.die('terminated during startup (signal %d)' % signum)
+
+    @classmethod
+    def _open_signal_pipe(cls):
+        # signal handlers write to this pipe, the other end of which is watched by the loop. It is
+        # used as the interpreter wakeup fd too, so that the loop gives the hand back for running
+        # the handlers at once, instead of whenever the loop would have yielded by itself
+        if NROSNode._signal_pipe is None:
+            r, w = os.pipe()
+            for fd in (r, w):
+                fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+            NROSNode._signal_pipe = r, w
+        signal.set_wakeup_fd(NROSNode._signal_pipe[1])
+
+    @classmethod
+    def _close_signal_handling(cls):
+        # back to the interpreter defaults once the loop is exited, so that signals received later on
+        # are not written to a pipe nobody reads anymore
+        cls._running = False
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        # discard what could have been written after the last read, not to mislead a next run
+        cls._read_signal_pipe(NROSNode._signal_pipe[0])
+
+    @staticmethod
+    def _read_signal_pipe(fd):
+        # returns the signals notified by the handler, the other bytes being written by the
+        # interpreter wakeup mechanism
+        signums = []
+        try:
+            while True:
+                data = os.read(fd, 64)
+                if not data:
+                    break
+                signums.extend(_TOKEN_SIGNALS[token] for token in data if token in _TOKEN_SIGNALS)
+        except OSError as e:
+            if e.errno != errno.EAGAIN:
+                raise
+        return signums
+
+    @classmethod
+    def _process_signal_pipe(cls, node, fd, condition):
+        signums = cls._read_signal_pipe(fd)
+        if signums and cls._running:
+            cls._running = False
+            logger = cls.log()
+            logger.info('!!! signal %d caught !!!', signums[0])
+            logger.info(cls._TERMINATION_BANNER)
+            # a further termination signal kills the process, in case the shutdown gets stuck
+            for signum in _SIGNAL_TOKENS:
+                signal.signal(signum, signal.SIG_DFL)
+            node.terminate()
+        return True
+
+    @classmethod
+    def _refresh_ids(cls):
+        """ Updates the process identity cached at import time.
+
+        Must be called in the child process by sub-classes which fork (or change the process user)
+        before a node is created there.
+        """
+        global _PID, _UID, _IS_ROOT, _LOG_DIR
+        _PID = os.getpid()
+        _UID = os.getuid()
+        _IS_ROOT = os.geteuid() == 0
+        _LOG_DIR = '/var/log/nros' if _IS_ROOT else os.path.expanduser('~/.nros/log')
 
     @classmethod
     def _process_command_line(cls, args=None):
         parser = cli.get_argument_parser()
-        parser.add_argument(
-            '-n', '--name',
-            dest='name',
-            help='node name (default: nros.%s-<pid>)' % cls.__name__
-        )
-        parser.add_argument(
-            '-C', '--config',
-            dest='config',
-            type=file,
-            help='configuration file path (default: %(default)s)'
-        )
-        parser.add_argument(
-            '--logger-config',
-            dest='log_cfg',
-            type=file,
-            help='logging customisation (default: %(default)s)'
-        )
+        for flags, kwargs in _COMMON_ARGS:
+            parser.add_argument(*flags, **dict(kwargs, help=kwargs['help'].format(node_class=cls.__name__)))
 
-        cls.add_arguments_to_parser(parser)
+        for flags, kwargs in cls.add_arguments_to_parser(parser) or ():
+            parser.add_argument(*flags, **kwargs)
 
         try:
             return parser.parse_args(args=args.split() if isinstance(args, basestring) else args)
@@ -364,59 +597,112 @@ class NROSNode(object):
             cls.die("invalid arguments : %s" % e)
 
     @classmethod
-    def _init_dbus(cls):
+    def _bg_start_bus(cls):
         # starts a dedicated session bus in none is currently active
-        # and retrieve its settings
-        session_bus_config, was_running = start_session_bus(cls._logger)
-        cls._logger.info('nROS bus configuration :')
-        for k, v in session_bus_config.iteritems():
-            cls._logger.info("- %-25s : %s", k, v)
+        # and retrieve its settings (executed in a background thread)
+        try:
+            cls._bus_cfg, _ = start_session_bus(cls.log(), adopt=True)
+        except Exception as e:
+            cls._bus_error = e
+
+    @classmethod
+    def _connect_bus(cls):
+        # to be called once the bus startup thread is terminated
+        if cls._bus_error:
+            cls.die("nROS bus startup failure", cls._bus_error)
+
+        session_bus_config = cls._bus_cfg
+        logger = cls.log()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                'nROS bus configuration :\n%s',
+                '\n'.join("- %-25s : %s" % kv for kv in sorted(session_bus_config.items()))
+            )
 
         os.environ.update(session_bus_config)
+        import dbus
 
+        cls._session_bus = dbus.SessionBus()
+
+    @classmethod
+    def get_session_bus(cls):
+        """ Returns the connection to the nROS bus shared by the whole node.
+
+        It is available as soon as the node is created (from :py:meth:`setup_dbus_environment` on
+        if :py:attr:`deferred_bus_connection` is set), and should be used instead of creating new
+        connections.
+
+        :rtype: dbus.Bus
+        """
+        return cls._session_bus
+
+    def batched_updates(self, path, flush_interval=None):
+        """ Returns a batch collecting properties changes of an object, to be sent as a single
+        ``PropertiesChanged`` signal per interface.
+
+        Intended usage is:
+
+        >>> with self.batched_updates('/my/object') as batch:
+        >>>     batch.update('org.pobot.nros.MyInterface', 'speed', speed)
+        >>>     batch.update('org.pobot.nros.MyInterface', 'position', position)
+
+        Can be used from :py:meth:`setup_dbus_environment` on.
+
+        :param str path: the path of the object owning the properties
+        :param int flush_interval: if set, the period (in ms) at which pending changes are sent
+            by the main loop, in addition to when the batch is closed
+        :rtype: :py:class:`nros.core.properties.PropertiesChangedBatch`
+        """
+        return PropertiesChangedBatch(self._session_bus, path, flush_interval=flush_interval)
+
+    @classmethod
+    def _init_dbus(cls):
         # start the D-Bus main loop now
-        dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
-        gobject.threads_init()
-        dbus.mainloop.glib.threads_init()
-        cls._loop = cls.get_mainloop()
+        import dbus.mainloop.glib
+        import gobject
+
+        # the GLib integration is process wide, so it is installed only by the first node started
+        if not NROSNode._dbus_inited:
+            dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+            if cls.multithreaded:
+                gobject.threads_init()
+                dbus.mainloop.glib.threads_init()
+            NROSNode._dbus_inited = True
 
     @classmethod
     def _setup_logging(cls, cfg_path):
-        # by default, the log is named after the main script
-        log_name = os.path.splitext(os.path.basename(sys.argv[0]))[0] + '.log'
+        # logging is configured once per process (by the first node started), since dictConfig
+        # resets the existing loggers each time it is invoked
+        if not NROSNode._logging_configured:
+            log_dir, dict_cfg = cls._resolve_logging_cfg(cfg_path)
 
-        # log files default location, based on the current user
-        log_dir = '/var/log/nros' if os.getuid() == 0 else '~/.nros/log'
+            try:
+                os.makedirs(log_dir)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+
+            logging.config.dictConfig(dict_cfg)
+            NROSNode._logging_configured = True
+
+    @classmethod
+    def _resolve_logging_cfg(cls, cfg_path):
+        log_dir, log_name = _LOG_DIR, _LOG_NAME
 
         if cfg_path:
-            import json
-            custom_cfg = json.load(cfg_path)
+            custom_cfg = _read_json(cfg_path)
 
-            log_dir = custom_cfg.get('log_dir', log_dir)
+            if 'log_dir' in custom_cfg:
+                log_dir = os.path.abspath(os.path.expanduser(custom_cfg['log_dir']))
             log_name = custom_cfg.get('log_name', log_name)
         else:
             custom_cfg = None
 
-        log_dir = os.path.abspath(os.path.expanduser(log_dir))
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        log_path = os.path.join(log_dir, log_name)
-
-        # customized the variable parts of the configuration
-        logging_cfg = {
-            'handlers': {
-                'file': {
-                    'filename': log_path
-                }
-            }
-        }
-
-        # if a custom configuration file has been provided, override current settings with its content
-        if custom_cfg:
-            log.deep_update(logging_cfg, custom_cfg)
-
-        # we can configure the logging now
-        logging.config.dictConfig(log.get_logging_configuration(logging_cfg))
-        logger = logging.getLogger(cls.__name__)
-
-        return logger
+        # the custom configuration (if any) is merged in the default one in a single pass, the log
+        # file path being then set unless the custom configuration already defines it
+        logging_cfg = log.get_logging_configuration(custom_cfg)
+        file_handler = logging_cfg['handlers'].get('file')
+        if file_handler is not None and not file_handler.get('filename'):
+            file_handler['filename'] = os.path.join(log_dir, log_name)
+
+        return log_dir, logging_cfg
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Helpers for publishing D-Bus properties changes.
+
+Publishing one ``PropertiesChanged`` signal per modified property is costly when many of them
+change together, since each signal goes through the bus daemon. The :py:class:`PropertiesChangedBatch`
+defined here collects the changes and sends a single signal per interface instead.
+"""
+
+import threading
+
+__author__ = 'Eric Pascual'
+
+__all__ = ['PropertiesChangedBatch']
+
+PROPERTIES_IFACE = 'org.freedesktop.DBus.Properties'
+
+
+class PropertiesChangedBatch(object):
+    """ Accumulates properties changes of a D-Bus object and emits them grouped by interface.
+
+    It is meant to be used as a context manager around a burst of updates, the signals being
+    sent when the block is exited:
+
+    >>> with node.batched_updates('/sensors/imu') as batch:
+    >>>     batch.update('org.pobot.nros.Imu', 'heading', heading)
+    >>>     batch.update('org.pobot.nros.Imu', 'pitch', pitch)
+
+    If a flush interval is given, pending changes are also sent periodically by the main loop,
+    which coalesces updates made across this window. The batch must then be closed (or used as
+    a context manager) to stop the timer.
+
+    Updates can be made from any thread.
+    """
+    def __init__(self, bus, path, flush_interval=None):
+        """
+        :param bus: the D-Bus connection used to send the signals
+        :param str path: the path of the object owning the properties
+        :param int flush_interval: the period (in ms) of automatic flushes. None to disable them.
+        """
+        self._bus = bus
+        self._path = path
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+        if flush_interval:
+            import gobject
+            self._timer = gobject.timeout_add(flush_interval, self._on_timer)
+
+    def update(self, interface, prop, value):
+        """ Records a property change, overriding any pending change of the same property.
+
+        :param str interface: the interface the property belongs to
+        :param str prop: the property name
+        :param value: the new value of the property
+        """
+        with self._lock:
+            self._pending.setdefault(interface, {})[prop] = value
+
+    def flush(self):
+        """ Sends the pending changes, as one ``PropertiesChanged`` signal per interface.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+
+        from dbus.lowlevel import SignalMessage
+
+        for interface, changed in pending.iteritems():
+            msg = SignalMessage(self._path, PROPERTIES_IFACE, 'PropertiesChanged')
+            msg.append(interface, changed, [], signature='sa{sv}as')
+            self._bus.send_message(msg)
+
+    def close(self):
+        """ Stops the automatic flushes if any, and sends the remaining changes.
+        """
+        if self._timer is not None:
+            import gobject
+            gobject.source_remove(self._timer)
+            self._timer = None
+        self.flush()
+
+    def _on_timer(self):
+        self.flush()
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()